@@ -3,14 +3,16 @@ Database Helper Functions
 
 MongoDB helper functions ready to use in your backend code.
 Import and use these functions in your API endpoints for database operations.
+The client is Motor (asyncio), so the helpers are coroutines and must be awaited.
 """
 
-from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient
 from datetime import datetime, timezone
 import os
 from dotenv import load_dotenv
-from typing import Union
+from typing import List, Union
 from pydantic import BaseModel
+import msgspec
 
 # Load environment variables from .env file
 load_dotenv()
@@ -22,34 +24,89 @@ database_url = os.getenv("DATABASE_URL")
 database_name = os.getenv("DATABASE_NAME")
 
 if database_url and database_name:
-    _client = MongoClient(database_url)
+    # One long-lived client per process; keep a few warm sockets so requests
+    # don't pay the TCP/TLS handshake, and fail fast if the server is unreachable.
+    _client = AsyncIOMotorClient(
+        database_url,
+        maxPoolSize=50,
+        minPoolSize=5,
+        maxIdleTimeMS=60000,
+        serverSelectionTimeoutMS=3000,
+        retryWrites=True,
+        compressors="zlib",
+    )
     db = _client[database_name]
 
 # Helper functions for common database operations
-def create_document(collection_name: str, data: Union[BaseModel, dict]):
-    """Insert a single document with timestamp"""
+def _utc_now() -> datetime:
+    """Current UTC time as Mongo reads it back: naive and truncated to milliseconds"""
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return now.replace(microsecond=now.microsecond // 1000 * 1000)
+
+def _to_doc(data: Union[BaseModel, msgspec.Struct, dict]) -> dict:
+    """Convert a Pydantic model / msgspec Struct to a dict if needed; unset optional fields are not stored"""
+    if isinstance(data, BaseModel):
+        return data.model_dump(exclude_none=True)
+    if isinstance(data, msgspec.Struct):
+        return {k: v for k, v in msgspec.structs.asdict(data).items() if v is not None}
+    return data.copy()
+
+async def insert_document(collection_name: str, data: Union[BaseModel, msgspec.Struct, dict]) -> dict:
+    """Insert a single document with timestamp and return it as stored (including _id)"""
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
 
-    # Convert Pydantic model to dict if needed
-    if isinstance(data, BaseModel):
-        data_dict = data.model_dump()
-    else:
-        data_dict = data.copy()
+    data_dict = _to_doc(data)
+
+    # Same representation as a later read, so the echoed document matches a GET
+    now = _utc_now()
+    data_dict['created_at'] = now
+    data_dict['updated_at'] = now
 
-    data_dict['created_at'] = datetime.now(timezone.utc)
-    data_dict['updated_at'] = datetime.now(timezone.utc)
+    # insert_one sets _id on the dict it is given, so no refetch is needed
+    await db[collection_name].insert_one(data_dict)
+    return data_dict
 
-    result = db[collection_name].insert_one(data_dict)
-    return str(result.inserted_id)
+async def insert_documents(collection_name: str, data: List[Union[BaseModel, msgspec.Struct, dict]]) -> List[dict]:
+    """Insert several documents with timestamps in one round-trip and return them as stored (including _id)"""
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+
+    now = _utc_now()
+    docs = []
+    for item in data:
+        doc = _to_doc(item)
+        doc['created_at'] = now
+        doc['updated_at'] = now
+        docs.append(doc)
+
+    # insert_many sets _id on each dict; unordered lets the server apply them in parallel
+    await db[collection_name].insert_many(docs, ordered=False)
+    return docs
+
+async def create_document(collection_name: str, data: Union[BaseModel, msgspec.Struct, dict]):
+    """Insert a single document with timestamp"""
+    return str((await insert_document(collection_name, data))["_id"])
 
-def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None):
-    """Get documents from collection"""
+async def get_documents(
+    collection_name: str,
+    filter_dict: dict = None,
+    limit: int = None,
+    projection: dict = None,
+    hint: list = None,
+    sort: list = None,
+):
+    """Get documents from collection, optionally restricted to the fields in projection,
+    ordered by sort and forced onto the index in hint"""
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
     
-    cursor = db[collection_name].find(filter_dict or {})
+    cursor = db[collection_name].find(filter_dict or {}, projection)
+    if hint:
+        cursor = cursor.hint(hint)
+    if sort:
+        cursor = cursor.sort(sort)
     if limit:
         cursor = cursor.limit(limit)
     
-    return list(cursor)
+    return await cursor.to_list(length=None)
@@ -1,59 +1,259 @@
+import csv
+import functools
+import io
+import logging
 import os
-from typing import List, Optional, Any, Dict
-from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+import re
+from typing import Annotated, List, Optional, Any, Dict, Set, Tuple
+import msgspec
+import orjson
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo.errors import BulkWriteError
 
-from database import db, create_document, get_documents
+from database import db, insert_document, insert_documents, get_documents
 from schemas import Project as ProjectSchema, Building as BuildingSchema, Element as ElementSchema
 
-app = FastAPI(title="Measurement Management API")
+logger = logging.getLogger(__name__)
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+app = FastAPI(title="Measurement Management API", default_response_class=ORJSONResponse)
+
+# CORS headers, built once: any origin, method and header, with credentials
+_CORS_METHODS = (b"DELETE", b"GET", b"HEAD", b"OPTIONS", b"PATCH", b"POST", b"PUT")
+_CORS_SIMPLE_HEADERS = (
+    (b"access-control-allow-origin", b"*"),
+    (b"access-control-allow-credentials", b"true"),
+)
+_CORS_PREFLIGHT_HEADERS = (
+    (b"vary", b"Origin"),
+    (b"access-control-allow-methods", b", ".join(_CORS_METHODS)),
+    (b"access-control-max-age", b"600"),
+    (b"access-control-allow-credentials", b"true"),
+    (b"content-type", b"text/plain; charset=utf-8"),
 )
 
+def _set_header(headers: List[Tuple[bytes, bytes]], key: bytes, value: bytes) -> None:
+    """Set ``key`` on a raw ASGI header list, replacing any existing entries (as MutableHeaders does)"""
+    found = [i for i, (k, _) in enumerate(headers) if k == key]
+    for i in reversed(found[1:]):
+        del headers[i]
+    if found:
+        headers[found[0]] = (key, value)
+    else:
+        headers.append((key, value))
+
+class StaticCORSMiddleware:
+    """The policy of CORSMiddleware(allow_origins=["*"], allow_credentials=True, allow_methods=["*"],
+    allow_headers=["*"]) as a raw ASGI middleware setting prebuilt header tuples"""
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        origin = cookie = request_method = request_headers = None
+        # First occurrence of each header wins, as with Starlette's Headers.get()
+        for key, value in scope["headers"]:
+            if key == b"origin" and origin is None:
+                origin = value
+            elif key == b"cookie" and cookie is None:
+                cookie = value
+            elif key == b"access-control-request-method" and request_method is None:
+                request_method = value
+            elif key == b"access-control-request-headers" and request_headers is None:
+                request_headers = value
+        if origin is None:
+            return await self.app(scope, receive, send)
+
+        if scope["method"] == "OPTIONS" and request_method is not None:
+            body, status = (b"OK", 200) if request_method in _CORS_METHODS else (b"Disallowed CORS method", 400)
+            headers = [*_CORS_PREFLIGHT_HEADERS, (b"access-control-allow-origin", origin),
+                       (b"content-length", str(len(body)).encode())]
+            if request_headers is not None:
+                headers.append((b"access-control-allow-headers", request_headers))
+            await send({"type": "http.response.start", "status": status, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                headers = message["headers"] = list(message.get("headers", ()))
+                for key, value in _CORS_SIMPLE_HEADERS:
+                    _set_header(headers, key, value)
+                # Credentialed requests can't use the "*" wildcard, so echo their origin back
+                if cookie is not None:
+                    _set_header(headers, b"access-control-allow-origin", origin)
+                    vary = next((v for k, v in headers if k == b"vary"), None)
+                    _set_header(headers, b"vary", vary + b", Origin" if vary is not None else b"Origin")
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+app.add_middleware(StaticCORSMiddleware)
+
 
 # Helpers
-class PyObjectId(ObjectId):
-    @classmethod
-    def __get_validators__(cls):
-        yield cls.validate
-
-    @classmethod
-    def validate(cls, v):
-        if isinstance(v, ObjectId):
-            return v
-        if not ObjectId.is_valid(v):
-            raise ValueError("Invalid ObjectId")
-        return ObjectId(v)
-
-def serialize_doc(doc: Dict[str, Any]) -> Dict[str, Any]:
-    if not doc:
-        return doc
-    out = {}
-    for k, v in doc.items():
-        if isinstance(v, ObjectId):
-            out[k] = str(v)
-        else:
-            out[k] = v
-    return out
+@functools.lru_cache(maxsize=4096)
+def _to_oid(s: str) -> ObjectId:
+    """Parse a 24-hex string id, memoized since the same ids come back on many requests"""
+    # ObjectId(None) generates a fresh id instead of failing, and that would be cached
+    if not isinstance(s, str):
+        raise ValueError("Invalid ObjectId")
+    try:
+        return ObjectId(s)
+    except (InvalidId, TypeError):
+        raise ValueError("Invalid ObjectId")
+
+def parse_oid(value: str, field: str) -> ObjectId:
+    """Validate and convert an id from the request, answering 400 if it is malformed"""
+    try:
+        return _to_oid(value)
+    except ValueError:
+        raise HTTPException(400, f"Invalid {field}")
+
+def _orjson_default(o: Any) -> Any:
+    if isinstance(o, ObjectId):
+        return str(o)
+    raise TypeError(f"Type is not JSON serializable: {type(o).__name__}")
+
+def json_response(content: Any) -> Response:
+    """Encode raw Mongo documents (one or a list) in a single orjson call; ObjectIds become strings"""
+    return Response(orjson.dumps(content, default=_orjson_default), media_type="application/json")
+
+def fields_projection(fields: Optional[str]) -> Optional[Dict[str, int]]:
+    """Turn a comma-separated ``fields`` query parameter into a Mongo projection, answering 400 for
+    names the server would reject (empty parts, a leading ``$``, or one path nested in another)"""
+    if not fields:
+        return None
+    names = list(dict.fromkeys(f.strip() for f in fields.split(",")))
+    for name in names:
+        if any(not part or part.startswith("$") for part in name.split(".")):
+            raise HTTPException(400, f"Invalid field name: {name!r}")
+        if any(other.startswith(name + ".") for other in names):
+            raise HTTPException(400, f"Field {name!r} collides with one of its subfields")
+    return {name: 1 for name in names}
+
+# Page size bounds for the list endpoints
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+# Largest batch accepted by POST /elements/batch, in line with the largest page a read returns
+MAX_BATCH_SIZE = MAX_PAGE_SIZE
+PAGE_SORT = [("_id", 1)]
+
+def page_query(query: Dict[str, Any], after_id: Optional[str]) -> Dict[str, Any]:
+    """Restrict ``query`` to documents after ``after_id``, for keyset pagination in ``_id`` order"""
+    if after_id:
+        query["_id"] = {"$gt": parse_oid(after_id, "after_id")}
+    return query
+
+async def find_parents(project_id: ObjectId, building_ids: List[ObjectId]) -> Set[Tuple[str, ObjectId]]:
+    """Look up a project and its buildings in one round-trip; returns the (collection, _id) pairs found"""
+    pipeline: List[Dict[str, Any]] = [
+        {"$match": {"_id": project_id}},
+        {"$project": {"_id": 1, "coll": {"$literal": "project"}}},
+    ]
+    if building_ids:
+        pipeline.append({"$unionWith": {"coll": "building", "pipeline": [
+            {"$match": {"_id": {"$in": building_ids}}},
+            {"$project": {"_id": 1, "coll": {"$literal": "building"}}},
+        ]}})
+    found = await db["project"].aggregate(pipeline).to_list(length=None)
+    return {(d["coll"], d["_id"]) for d in found}
+
+# Fields read by the CSV export; everything else (URLs, timestamps, ...) stays on the server
+CSV_PROJECTION = {
+    "_id": 1, "element_type": 1, "configuration": 1, "opening": 1, "height_mm": 1,
+    "width_mm": 1, "depth_mm": 1, "thickness_mm": 1, "quantity": 1, "notes_text": 1,
+}
+# Header row of the CSV export, encoded once (csv.writer's default dialect ends rows with \r\n)
+CSV_HEADER = "ID,Type,Configuration,Ouverture,Hauteur(mm),Largeur(mm),Profondeur(mm),Épaisseur(mm),Quantité,Notes\r\n".encode()
+
+
+# Indexes backing the hot query predicates
+ELEMENT_PROJECT_INDEX = [("project_id", 1), ("_id", 1)]
+ELEMENT_PARENT_INDEX = [("project_id", 1), ("building_id", 1), ("_id", 1)]
+ELEMENT_SUMMARY_INDEX = [("project_id", 1), ("element_type", 1), ("configuration", 1), ("quantity", 1)]
+
+@app.on_event("startup")
+async def ensure_indexes():
+    if db is None:
+        return
+    try:
+        await db["element"].create_index(ELEMENT_PROJECT_INDEX)
+        await db["element"].create_index(ELEMENT_PARENT_INDEX)
+        await db["element"].create_index(ELEMENT_SUMMARY_INDEX)
+        await db["building"].create_index([("project_id", 1), ("_id", 1)])
+    except Exception as e:
+        # Don't keep the API from starting; /test reports database problems
+        logger.warning("Could not create indexes: %s", e)
+        return
+    try:
+        await check_query_plans()
+    except Exception as e:
+        logger.warning("Could not explain hot queries: %s", e)
+
+# Index hints for hot queries whose winning plan doesn't use the index built for them, filled at startup
+query_hints: Dict[str, List[Tuple[str, int]]] = {}
+
+def _scanned_indexes(plan: Any) -> List[Tuple[Tuple[str, int], ...]]:
+    found: List[Tuple[Tuple[str, int], ...]] = []
+    if isinstance(plan, dict):
+        if isinstance(plan.get("keyPattern"), dict):
+            found.append(tuple((k, int(v)) for k, v in plan["keyPattern"].items()))
+        for v in plan.values():
+            found += _scanned_indexes(v)
+    elif isinstance(plan, list):
+        for v in plan:
+            found += _scanned_indexes(v)
+    return found
+
+def winning_plan_indexes(explain: Any) -> List[Tuple[Tuple[str, int], ...]]:
+    """Key patterns of the indexes scanned by every winningPlan in an explain() result (find or aggregate, any nesting)"""
+    found: List[Tuple[Tuple[str, int], ...]] = []
+    if isinstance(explain, dict):
+        for k, v in explain.items():
+            found += _scanned_indexes(v) if k == "winningPlan" else winning_plan_indexes(v)
+    elif isinstance(explain, list):
+        for v in explain:
+            found += winning_plan_indexes(v)
+    return found
+
+async def check_query_plans():
+    """Explain the list/summary queries once and hint their index if the planner picks another plan
+    (a COLLSCAN, or e.g. the _id index plus a FETCH filter for the _id-sorted pages)"""
+    probe = str(ObjectId())
+    plans = {
+        "list_elements": (ELEMENT_PROJECT_INDEX, await db.command(
+            "explain",
+            {"find": "element", "filter": {"project_id": probe}, "sort": dict(PAGE_SORT)},
+            verbosity="queryPlanner")),
+        "list_building_elements": (ELEMENT_PARENT_INDEX, await db.command(
+            "explain",
+            {"find": "element", "filter": {"project_id": probe, "building_id": probe}, "sort": dict(PAGE_SORT)},
+            verbosity="queryPlanner")),
+        "project_summary": (ELEMENT_SUMMARY_INDEX, await db.command(
+            "aggregate", "element", pipeline=summary_pipeline(probe), explain=True)),
+    }
+    for name, (index, explain) in plans.items():
+        used = winning_plan_indexes(explain)
+        if tuple(index) not in used:
+            logger.warning("%s would scan %s; hinting index %s", name, used or "the collection", index)
+            query_hints[name] = index
 
 
 # Root
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "Measurement Management API is running"}
 
 
 # Health and DB test
 @app.get("/test")
-def test_database():
+async def test_database():
     response = {
         "backend": "✅ Running",
         "database": "❌ Not Available",
@@ -67,7 +267,7 @@ def test_database():
             response["database"] = "✅ Available"
             response["connection_status"] = "Connected"
             try:
-                response["collections"] = db.list_collection_names()[:10]
+                response["collections"] = (await db.list_collection_names())[:10]
                 response["database"] = "✅ Connected & Working"
             except Exception as e:
                 response["database"] = f"⚠️ Connected but Error: {str(e)[:50]}"
@@ -82,47 +282,91 @@ def test_database():
 class ProjectCreate(ProjectSchema):
     pass
 
-class ProjectOut(ProjectSchema):
-    id: str = Field(..., description="Document ID")
+class ProjectOut(ProjectSchema, kw_only=True):
+    id: Annotated[str, msgspec.Meta(description="Document ID")]
 
 class BuildingCreate(BuildingSchema):
     pass
 
-class BuildingOut(BuildingSchema):
+class BuildingOut(BuildingSchema, kw_only=True):
     id: str
 
 class ElementCreate(ElementSchema):
     pass
 
-class ElementOut(ElementSchema):
+class ElementOut(ElementSchema, kw_only=True):
     id: str
 
+# msgspec reports the failing location as a suffix like " - at `$.items[0].name`"
+_MSGSPEC_ERROR_AT = re.compile(r"^(.*) - at `\$(.*)`$", re.S)
+_MSGSPEC_PATH_PART = re.compile(r"\.([^.\[]+)|\[(\d+)\]")
+_MSGSPEC_MISSING_FIELD = re.compile(r"^Object missing required field `(.*)`$")
+
+def msgspec_validation_error(e: msgspec.DecodeError) -> RequestValidationError:
+    """Turn a msgspec decoding error into the ``{loc, msg, type}`` list FastAPI answers 422s with"""
+    match = _MSGSPEC_ERROR_AT.match(str(e))
+    msg, path = (match.group(1), match.group(2)) if match else (str(e), "")
+    loc: List[Any] = ["body", *(key or int(index) for key, index in _MSGSPEC_PATH_PART.findall(path))]
+    error_type = "value_error" if isinstance(e, msgspec.ValidationError) else "json_invalid"
+    missing = _MSGSPEC_MISSING_FIELD.match(msg)
+    if missing:
+        loc.append(missing.group(1))
+        msg, error_type = "Field required", "missing"
+    return RequestValidationError([{"loc": loc, "msg": msg, "type": error_type}])
+
+def msgspec_body(model: Any):
+    """Dependency decoding the JSON request body into ``model`` with msgspec, bypassing Pydantic"""
+    decoder = msgspec.json.Decoder(model, strict=False)
+
+    async def decode(request: Request):
+        try:
+            return decoder.decode(await request.body())
+        except msgspec.DecodeError as e:
+            raise msgspec_validation_error(e)
+
+    return decode
+
+def msgspec_openapi(model: Any, many: bool = False) -> Dict[str, Any]:
+    """``openapi_extra`` documenting a msgspec_body() request body (a list of ``model`` if ``many``), which FastAPI cannot see"""
+    _, components = msgspec.json.schema_components([model])
+    schema = components[model.__name__]
+    if many:
+        schema = {"type": "array", "items": schema}
+    return {"requestBody": {"required": True, "content": {"application/json": {"schema": schema}}}}
+
 
 # Projects endpoints
-@app.post("/projects", response_model=dict)
-def create_project(payload: ProjectCreate):
+@app.post("/projects", response_model=dict, openapi_extra=msgspec_openapi(ProjectCreate))
+async def create_project(payload: ProjectCreate = Depends(msgspec_body(ProjectCreate))):
     try:
-        inserted_id = create_document("project", payload)
-        doc = db["project"].find_one({"_id": ObjectId(inserted_id)})
-        return serialize_doc(doc)
+        doc = await insert_document("project", payload)
+        return json_response(doc)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/projects", response_model=List[dict])
-def list_projects():
+async def list_projects(
+    fields: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after_id: Optional[str] = None,
+):
     try:
-        docs = get_documents("project")
-        return [serialize_doc(d) for d in docs]
+        docs = await get_documents(
+            "project", page_query({}, after_id), limit=limit, projection=fields_projection(fields), sort=PAGE_SORT
+        )
+        return json_response(docs)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/projects/{project_id}", response_model=dict)
-def get_project(project_id: str):
+async def get_project(project_id: str):
     try:
-        doc = db["project"].find_one({"_id": PyObjectId.validate(project_id)})
+        doc = await db["project"].find_one({"_id": parse_oid(project_id, "project_id")})
         if not doc:
             raise HTTPException(404, "Project not found")
-        return serialize_doc(doc)
+        return json_response(doc)
     except HTTPException:
         raise
     except Exception as e:
@@ -130,28 +374,32 @@ def get_project(project_id: str):
 
 
 # Buildings endpoints
-@app.post("/buildings", response_model=dict)
-def create_building(payload: BuildingCreate):
+@app.post("/buildings", response_model=dict, openapi_extra=msgspec_openapi(BuildingCreate))
+async def create_building(payload: BuildingCreate = Depends(msgspec_body(BuildingCreate))):
     # Ensure project exists
-    _pid = payload.project_id
-    if not ObjectId.is_valid(_pid):
-        raise HTTPException(400, "Invalid project_id")
-    if not db["project"].find_one({"_id": ObjectId(_pid)}):
+    _pid = parse_oid(payload.project_id, "project_id")
+    if not await db["project"].find_one({"_id": _pid}, {"_id": 1}):
         raise HTTPException(404, "Parent project not found")
     try:
-        inserted_id = create_document("building", payload)
-        doc = db["building"].find_one({"_id": ObjectId(inserted_id)})
-        return serialize_doc(doc)
+        doc = await insert_document("building", payload)
+        return json_response(doc)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/projects/{project_id}/buildings", response_model=List[dict])
-def list_buildings(project_id: str):
+async def list_buildings(
+    project_id: str,
+    fields: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after_id: Optional[str] = None,
+):
     try:
-        if not ObjectId.is_valid(project_id):
-            raise HTTPException(400, "Invalid project_id")
-        docs = get_documents("building", {"project_id": project_id})
-        return [serialize_doc(d) for d in docs]
+        parse_oid(project_id, "project_id")
+        docs = await get_documents(
+            "building", page_query({"project_id": project_id}, after_id),
+            limit=limit, projection=fields_projection(fields), sort=PAGE_SORT,
+        )
+        return json_response(docs)
     except HTTPException:
         raise
     except Exception as e:
@@ -159,38 +407,70 @@ def list_buildings(project_id: str):
 
 
 # Elements endpoints
-@app.post("/elements", response_model=dict)
-def create_element(payload: ElementCreate):
-    # ensure project exists
-    if not ObjectId.is_valid(payload.project_id):
-        raise HTTPException(400, "Invalid project_id")
-    if not db["project"].find_one({"_id": ObjectId(payload.project_id)}):
+@app.post("/elements", response_model=dict, openapi_extra=msgspec_openapi(ElementCreate))
+async def create_element(payload: ElementCreate = Depends(msgspec_body(ElementCreate))):
+    # ensure project (and building, if provided) exist, in a single query
+    pid = parse_oid(payload.project_id, "project_id")
+    bid = parse_oid(payload.building_id, "building_id") if payload.building_id else None
+    found = await find_parents(pid, [bid] if bid else [])
+    if ("project", pid) not in found:
+        raise HTTPException(404, "Parent project not found")
+    if bid and ("building", bid) not in found:
+        raise HTTPException(404, "Parent building not found")
+    try:
+        doc = await insert_document("element", payload)
+        return json_response(doc)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/elements/batch", response_model=List[dict], openapi_extra=msgspec_openapi(ElementCreate, many=True))
+async def create_elements(payloads: List[ElementCreate] = Depends(msgspec_body(List[ElementCreate]))):
+    if not payloads:
+        raise HTTPException(400, "No elements given")
+    if len(payloads) > MAX_BATCH_SIZE:
+        raise HTTPException(400, f"At most {MAX_BATCH_SIZE} elements per batch")
+    if len({p.project_id for p in payloads}) != 1:
+        raise HTTPException(400, "All elements must belong to the same project")
+    # one existence check for the project and every referenced building
+    pid = parse_oid(payloads[0].project_id, "project_id")
+    bids = {parse_oid(p.building_id, "building_id") for p in payloads if p.building_id}
+    found = await find_parents(pid, list(bids))
+    if ("project", pid) not in found:
         raise HTTPException(404, "Parent project not found")
-    # if building_id provided, ensure it exists
-    if payload.building_id:
-        if not ObjectId.is_valid(payload.building_id):
-            raise HTTPException(400, "Invalid building_id")
-        if not db["building"].find_one({"_id": ObjectId(payload.building_id)}):
-            raise HTTPException(404, "Parent building not found")
+    if any(("building", bid) not in found for bid in bids):
+        raise HTTPException(404, "Parent building not found")
     try:
-        inserted_id = create_document("element", payload)
-        doc = db["element"].find_one({"_id": ObjectId(inserted_id)})
-        return serialize_doc(doc)
+        docs = await insert_documents("element", payloads)
+        return json_response(docs)
+    except BulkWriteError as e:
+        # The insert is unordered, so every element not listed in "failed" was stored
+        raise HTTPException(status_code=500, detail={
+            "message": "Some elements could not be stored",
+            "inserted": e.details.get("nInserted", 0),
+            "failed": [{"index": err["index"], "error": err["errmsg"]} for err in e.details.get("writeErrors", [])],
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/projects/{project_id}/elements", response_model=List[dict])
-def list_elements(project_id: str, building_id: Optional[str] = None):
+async def list_elements(
+    project_id: str,
+    building_id: Optional[str] = None,
+    fields: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after_id: Optional[str] = None,
+):
     try:
-        if not ObjectId.is_valid(project_id):
-            raise HTTPException(400, "Invalid project_id")
+        parse_oid(project_id, "project_id")
         query: Dict[str, Any] = {"project_id": project_id}
         if building_id:
-            if not ObjectId.is_valid(building_id):
-                raise HTTPException(400, "Invalid building_id")
+            parse_oid(building_id, "building_id")
             query["building_id"] = building_id
-        docs = get_documents("element", query)
-        return [serialize_doc(d) for d in docs]
+        docs = await get_documents(
+            "element", page_query(query, after_id), limit=limit, projection=fields_projection(fields),
+            hint=query_hints.get("list_building_elements" if building_id else "list_elements"), sort=PAGE_SORT,
+        )
+        return json_response(docs)
     except HTTPException:
         raise
     except Exception as e:
@@ -198,71 +478,96 @@ def list_elements(project_id: str, building_id: Optional[str] = None):
 
 
 # Summary & Export
-@app.get("/projects/{project_id}/summary", response_model=dict)
-def project_summary(project_id: str):
-    if not ObjectId.is_valid(project_id):
-        raise HTTPException(400, "Invalid project_id")
-    pipeline = [
+def summary_pipeline(project_id: str) -> List[Dict[str, Any]]:
+    return [
         {"$match": {"project_id": project_id}},
+        # Only the grouped fields, so the scan can be covered by ELEMENT_SUMMARY_INDEX
+        {"$project": {"element_type": 1, "configuration": 1, "quantity": 1, "_id": 0}},
         {"$group": {
-            "_id": {"type": "$element_type", "config": "$configuration"},
+            # insert_document skips None fields but older documents hold explicit nulls; group both together
+            "_id": {
+                "type": {"$ifNull": ["$element_type", None]},
+                "config": {"$ifNull": ["$configuration", None]},
+            },
             "count": {"$sum": "$quantity"}
         }},
+        # Fold the groups into a single {total, items} document server-side
+        {"$group": {
+            "_id": None,
+            "total": {"$sum": "$count"},
+            "items": {"$push": {
+                "element_type": "$_id.type",
+                "configuration": "$_id.config",
+                "count": "$count",
+            }},
+        }},
     ]
+
+@app.get("/projects/{project_id}/summary", response_model=dict)
+async def project_summary(project_id: str):
+    parse_oid(project_id, "project_id")
+    hint = query_hints.get("project_summary")
     try:
-        agg = list(db["element"].aggregate(pipeline))
-        items = [
-            {
-                "element_type": a["_id"].get("type"),
-                "configuration": a["_id"].get("config"),
-                "count": a["count"],
-            }
-            for a in agg
-        ]
-        total = sum(i["count"] for i in items)
-        return {"total": total, "items": items}
+        cursor = db["element"].aggregate(summary_pipeline(project_id), **({"hint": hint} if hint else {}))
+        agg = await cursor.to_list(length=None)
+        if not agg:
+            return {"total": 0, "items": []}
+        return {"total": agg[0]["total"], "items": agg[0]["items"]}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/projects/{project_id}/export/csv")
-def export_csv(project_id: str):
-    if not ObjectId.is_valid(project_id):
-        raise HTTPException(400, "Invalid project_id")
-    # Build a CSV for elements
-    import csv
-    import io
+async def export_csv(project_id: str):
+    parse_oid(project_id, "project_id")
+    if db is None:
+        raise HTTPException(status_code=500, detail="Database not available")
+    # Stream the CSV row by row straight from the cursor. The first document is read before
+    # the response starts, so an unreachable database or a failing query is still a 500
+    elems = db["element"].find({"project_id": project_id}, CSV_PROJECTION, batch_size=500)
     try:
-        elems = get_documents("element", {"project_id": project_id})
-        output = io.StringIO()
-        writer = csv.writer(output)
-        writer.writerow([
-            "ID", "Type", "Configuration", "Ouverture", "Hauteur(mm)", "Largeur(mm)",
-            "Profondeur(mm)", "Épaisseur(mm)", "Quantité", "Notes"
-        ])
-        for e in elems:
-            writer.writerow([
-                str(e.get("_id")),
-                e.get("element_type", ""),
-                e.get("configuration", ""),
-                e.get("opening", ""),
-                e.get("height_mm", ""),
-                e.get("width_mm", ""),
-                e.get("depth_mm", ""),
-                e.get("thickness_mm", ""),
-                e.get("quantity", 1),
-                (e.get("notes_text") or "").replace("\n", " ")
-            ])
-        csv_content = output.getvalue()
-        return app.response_class(
-            content=csv_content,
-            media_type="text/csv",
-            headers={
-                "Content-Disposition": f"attachment; filename=project_{project_id}_elements.csv"
-            },
-        )
+        first = await elems.next()
+    except StopAsyncIteration:
+        first = None
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+
+    def csv_row(e: Dict[str, Any]) -> str:
+        writer.writerow([
+            str(e.get("_id")),
+            e.get("element_type", ""),
+            e.get("configuration", ""),
+            e.get("opening", ""),
+            e.get("height_mm", ""),
+            e.get("width_mm", ""),
+            e.get("depth_mm", ""),
+            e.get("thickness_mm", ""),
+            e.get("quantity", 1),
+            (e.get("notes_text") or "").replace("\n", " ")
+        ])
+        row = buf.getvalue()
+        buf.seek(0)
+        buf.truncate(0)
+        return row
+
+    async def iter_csv():
+        yield CSV_HEADER
+        if first is None:
+            return
+        yield csv_row(first)
+        async for e in elems:
+            yield csv_row(e)
+
+    return StreamingResponse(
+        iter_csv(),
+        media_type="text/csv",
+        headers={
+            "Content-Disposition": f"attachment; filename=project_{project_id}_elements.csv"
+        },
+    )
+
 
 if __name__ == "__main__":
     import uvicorn
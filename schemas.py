@@ -1,39 +1,40 @@
 """
 Database Schemas for Measurement Management App
 
-Each Pydantic model represents a collection in MongoDB.
+Each msgspec Struct represents a collection in MongoDB.
 Collection name is the lowercase of the class name.
+Request bodies are decoded and validated straight into these structs.
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional, Literal
+from msgspec import Meta, Struct
+from typing import Annotated, Optional, Literal
 
-class Project(BaseModel):
-    name: str = Field(..., description="Project name")
-    project_type: Literal[
+class Project(Struct, kw_only=True):
+    name: Annotated[str, Meta(description="Project name")]
+    project_type: Annotated[Literal[
         "Immeuble", "Résidence", "Villa", "École", "Hôtel", "Autre"
-    ] = Field("Autre", description="Type de projet")
-    location: Optional[str] = Field(None, description="Localisation du chantier")
-    contact_name: Optional[str] = Field(None, description="Nom du contact")
-    contact_phone: Optional[str] = Field(None, description="Téléphone du contact")
-    photo_url: Optional[str] = Field(None, description="Photo du projet (URL)")
+    ], Meta(description="Type de projet")] = "Autre"
+    location: Annotated[Optional[str], Meta(description="Localisation du chantier")] = None
+    contact_name: Annotated[Optional[str], Meta(description="Nom du contact")] = None
+    contact_phone: Annotated[Optional[str], Meta(description="Téléphone du contact")] = None
+    photo_url: Annotated[Optional[str], Meta(description="Photo du projet (URL)")] = None
 
-class Building(BaseModel):
-    project_id: str = Field(..., description="ID du projet parent")
-    name: str = Field(..., description="Nom du bâtiment / bloc")
-    description: Optional[str] = Field(None, description="Description facultative")
+class Building(Struct, kw_only=True):
+    project_id: Annotated[str, Meta(description="ID du projet parent")]
+    name: Annotated[str, Meta(description="Nom du bâtiment / bloc")]
+    description: Annotated[Optional[str], Meta(description="Description facultative")] = None
 
-class Element(BaseModel):
-    project_id: str = Field(..., description="ID du projet")
-    building_id: Optional[str] = Field(None, description="ID du bâtiment")
-    element_type: Literal["porte", "placard", "dressing"] = Field(..., description="Type d\'élément")
-    configuration: Optional[str] = Field(None, description="Configuration (simple/double, L, U, etc.)")
-    opening: Optional[Literal["poussant", "tirant"]] = Field(None, description="Sens d\'ouverture (portes)")
-    height_mm: Optional[float] = Field(None, ge=0, description="Hauteur en mm")
-    width_mm: Optional[float] = Field(None, ge=0, description="Largeur en mm")
-    depth_mm: Optional[float] = Field(None, ge=0, description="Profondeur en mm (placards/dressings)")
-    thickness_mm: Optional[float] = Field(None, ge=0, description="Épaisseur en mm")
-    quantity: int = Field(1, ge=1, description="Quantité")
-    notes_text: Optional[str] = Field(None, description="Notes écrites")
-    notes_audio_url: Optional[str] = Field(None, description="Note vocale (URL)")
-    photo_url: Optional[str] = Field(None, description="Photo (URL)")
+class Element(Struct, kw_only=True):
+    project_id: Annotated[str, Meta(description="ID du projet")]
+    building_id: Annotated[Optional[str], Meta(description="ID du bâtiment")] = None
+    element_type: Annotated[Literal["porte", "placard", "dressing"], Meta(description="Type d'élément")]
+    configuration: Annotated[Optional[str], Meta(description="Configuration (simple/double, L, U, etc.)")] = None
+    opening: Annotated[Optional[Literal["poussant", "tirant"]], Meta(description="Sens d'ouverture (portes)")] = None
+    height_mm: Optional[Annotated[float, Meta(ge=0, description="Hauteur en mm")]] = None
+    width_mm: Optional[Annotated[float, Meta(ge=0, description="Largeur en mm")]] = None
+    depth_mm: Optional[Annotated[float, Meta(ge=0, description="Profondeur en mm (placards/dressings)")]] = None
+    thickness_mm: Optional[Annotated[float, Meta(ge=0, description="Épaisseur en mm")]] = None
+    quantity: Annotated[int, Meta(ge=1, description="Quantité")] = 1
+    notes_text: Annotated[Optional[str], Meta(description="Notes écrites")] = None
+    notes_audio_url: Annotated[Optional[str], Meta(description="Note vocale (URL)")] = None
+    photo_url: Annotated[Optional[str], Meta(description="Photo (URL)")] = None